@@ -1,7 +1,53 @@
+import os
+import asyncio
+import tempfile
+import threading
+import time
+import numpy as np
 import yfinance as yf
 import pandas as pd
 import mplfinance as mpf
 import plotly.graph_objects as go
+import plotly.io as pio
+from cachetools import TTLCache, cached
+
+# Fetched historical data is cached on disk as Parquet and refetched once it is older than the TTL
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'financefetch_cache')
+CACHE_TTL = 60 * 60  # seconds
+
+# Watchlists longer than this are fetched through one batched yf.download call rather than per-symbol requests
+BATCH_DOWNLOAD_THRESHOLD = 20
+
+# Ticker metadata rarely changes intraday, so it is cached per symbol for an hour
+_TICKER_INFO_CACHE = TTLCache(maxsize=1024, ttl=60 * 60)
+
+# Chart rendering bands, by the number of bars in the requested range:
+#   up to WEBGL_THRESHOLD                      -> SVG candlesticks
+#   WEBGL_THRESHOLD to DOWNSAMPLE_THRESHOLD    -> WebGL OHLC traces with every bar
+#   above DOWNSAMPLE_THRESHOLD                 -> WebGL OHLC traces, LTTB-downsampled to DOWNSAMPLE_POINTS
+WEBGL_THRESHOLD = 2000
+DOWNSAMPLE_THRESHOLD = 5000
+DOWNSAMPLE_POINTS = 2000
+
+
+def normalize_symbols(symbols: list) -> list:
+    """
+    Upper-cases and de-duplicates ticker symbols the way yf.download does, keeping their order.
+    :param symbols: List of stock ticker symbols.
+    :return: List of unique upper-case symbols.
+    """
+    return list(dict.fromkeys(symbol.upper() for symbol in symbols))
+
+
+@cached(_TICKER_INFO_CACHE, lock=threading.Lock())
+def _ticker_info(symbol: str) -> dict:
+    """
+    Fetches the Yahoo Finance info blob for a symbol, cached per symbol.
+    :param symbol: Stock ticker symbol (e.g., 'AAPL').
+    :return: A dict with the ticker's info.
+    """
+    return yf.Ticker(symbol).info
+
 
 class StockDataFetcher:
     def __init__(self, symbol: str):
@@ -10,81 +56,184 @@ class StockDataFetcher:
         :param symbol: Stock ticker symbol (e.g., 'AAPL').
         """
         self.symbol = symbol
+        self._ticker = yf.Ticker(symbol)
+        self._earnings_dates = None
+        self._earnings_fetched_at = 0.0
+
+    @classmethod
+    def fetch_many(cls, symbols: list, period: str = "1y", interval: str = "1d") -> dict:
+        """
+        Fetches historical stock data for several symbols in a single batched request.
+        The download uses the same defaults as Ticker.history(): adjusted prices, dividend
+        and split columns, and a tz-aware index.
+
+        :param symbols: List of stock ticker symbols (e.g., ['AAPL', 'MSFT']).
+        :param period: Time period of the historical data (e.g., '1y', '5d', '1mo', etc.).
+        :param interval: Data interval (e.g., '1d' for daily, '1h' for hourly).
+        :return: A dict mapping each upper-cased symbol to a DataFrame with its historical data.
+        """
+        symbols = normalize_symbols(symbols)
+        data = yf.download(" ".join(symbols), period=period, interval=interval,
+                           threads=True, group_by="ticker", progress=False,
+                           auto_adjust=True, actions=True, ignore_tz=False)
+
+        # yf.download only adds the ticker level to the columns when given several symbols
+        if not isinstance(data.columns, pd.MultiIndex):
+            return {symbols[0]: data}
+        return {symbol: data[symbol].dropna(how='all') for symbol in symbols}
+
+    @classmethod
+    async def fetch_many_async(cls, symbols: list, period: str = "1y", interval: str = "1d") -> dict:
+        """
+        Fetches historical stock data for several symbols concurrently.
+
+        :param symbols: List of stock ticker symbols (e.g., ['AAPL', 'MSFT']).
+        :param period: Time period of the historical data (e.g., '1y', '5d', '1mo', etc.).
+        :param interval: Data interval (e.g., '1d' for daily, '1h' for hourly).
+        :return: A dict mapping each upper-cased symbol to a DataFrame with its historical data.
+        """
+        symbols = normalize_symbols(symbols)
+        loop = asyncio.get_running_loop()
+
+        # Large watchlists are cheaper as a single batched download
+        if len(symbols) > BATCH_DOWNLOAD_THRESHOLD:
+            return await loop.run_in_executor(None, cls.fetch_many, symbols, period, interval)
+
+        histories = await asyncio.gather(*[
+            loop.run_in_executor(None, lambda s=symbol: yf.Ticker(s).history(period=period, interval=interval))
+            for symbol in symbols
+        ])
+        return dict(zip(symbols, histories))
+
+    def get_earnings_dates(self) -> pd.DataFrame:
+        """
+        Fetches the earnings report dates for the symbol, caching them for CACHE_TTL seconds.
+        :return: A DataFrame indexed by earnings report date.
+        """
+        if self._earnings_dates is None or time.time() - self._earnings_fetched_at >= CACHE_TTL:
+            self._earnings_dates = self._ticker.earnings_dates
+            self._earnings_fetched_at = time.time()
+        return self._earnings_dates
     
-    def fetch_historical_data(self, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+    def cache_path(self, period: str = "1y", interval: str = "1d") -> str:
+        """
+        Builds the on-disk cache path for the symbol's historical data.
+
+        :param period: Time period of the historical data (e.g., '1y', '5d', '1mo', etc.).
+        :param interval: Data interval (e.g., '1d' for daily, '1h' for hourly).
+        :return: The Parquet file path for the given symbol, period and interval.
         """
-        Fetches historical stock data for the provided symbol and saves it to a CSV file.
+        # The symbol comes from user input, so never let it escape the cache directory
+        if '/' in self.symbol or '\\' in self.symbol or '..' in self.symbol:
+            raise ValueError(f"Invalid stock symbol: {self.symbol!r}")
+        return os.path.join(CACHE_DIR, f"{self.symbol}_{period}_{interval}.parquet")
+
+    def fetch_historical_data(self, period: str = "1y", interval: str = "1d", use_cache: bool = True) -> pd.DataFrame:
+        """
+        Fetches historical stock data for the provided symbol, reusing the on-disk cache while it is fresh.
         
-        :param csv_path: The file path where the CSV will be saved.
         :param period: Time period of the historical data (e.g., '1y', '5d', '1mo', etc.).
         :param interval: Data interval (e.g., '1d' for daily, '1h' for hourly).
+        :param use_cache: Whether to read from and write to the Parquet cache.
         :return: A DataFrame with historical data for the stock, including earnings report information.
         """
-        stock = yf.Ticker(self.symbol)
-        df = stock.history(period=period, interval=interval)
+        if use_cache:
+            cache_path = self.cache_path(period, interval)
+            if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < CACHE_TTL:
+                return self.load_historical_data(cache_path)
 
-        # Fetch earnings report dates
-        earnings_df = stock.earnings_dates
+        df = self._ticker.history(period=period, interval=interval)
 
-        # Ensure both DataFrame 'Date' columns are in the same format and timezone
-        earnings_df.index = pd.to_datetime(earnings_df.index).normalize()  # Normalize to remove time components
-        df.index = pd.to_datetime(df.index).normalize()  # Normalize the dates
+        # Fetch earnings report dates (cached for CACHE_TTL seconds)
+        earnings_df = self.get_earnings_dates()
 
-        # Add 'HasEarningsReport' column, marking True for dates with earnings reports
-        df['HasEarningsReport'] = df.index.isin(earnings_df.index)
+        # history() already returns a DatetimeIndex, so only the time components need removing
+        df.index = df.index.normalize()
+
+        # Add 'HasEarningsReport' column, marking True for dates with earnings reports.
+        # Comparing the raw int64 nanosecond values avoids pandas' tz-aware isin path.
+        earnings_index = earnings_df.index.tz_convert(df.index.tz).normalize()
+        df['HasEarningsReport'] = np.isin(df.index.asi8, np.unique(earnings_index.asi8))
 
         # Localize the index to the appropriate timezone if it is not already tz-aware
         if df.index.tz is None:
             df.index = df.index.tz_localize('America/New_York')
 
+        if use_cache:
+            # Write to a temporary file and swap it in atomically so concurrent workers never read a partial file
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.parquet.tmp')
+            os.close(fd)
+            try:
+                self.save_historical_data(df, tmp_path)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
         return df
     
-    def save_historical_data(self, data: pd.DataFrame, csv_path: str) -> None:
+    def save_historical_data(self, data: pd.DataFrame, path: str = None, csv_path: str = None) -> None:
         """
-        Saves historical stock data to a CSV file.
+        Saves historical stock data to a Parquet file, or to a CSV file if the path ends in '.csv'.
         
         :param data: A DataFrame containing historical stock data.
-        :param csv_path: The file path where the CSV will be saved.
+        :param path: The file path where the data will be saved.
+        :param csv_path: Former name of path, still accepted for existing callers.
         """
-        data.to_csv(csv_path)
+        path = path or csv_path
+        if path is None:
+            raise TypeError("save_historical_data() missing required argument: 'path'")
+
+        if path.endswith('.csv'):
+            data.to_csv(path)
+        else:
+            data.to_parquet(path, engine="pyarrow", compression="zstd")
     
-    def load_historical_data(self, csv_path: str) -> pd.DataFrame:
+    def load_historical_data(self, path: str = None, csv_path: str = None) -> pd.DataFrame:
         """
-        Loads historical stock data from a saved CSV file.
+        Loads historical stock data from a saved Parquet file, or from a CSV file if the path ends in '.csv'.
         
-        :param csv_path: The file path of the CSV to load.
+        :param path: The file path of the data to load.
+        :param csv_path: Former name of path, still accepted for existing callers.
         :return: A DataFrame with historical stock data.
         """
-        # Load the CSV into a DataFrame
-        df = pd.read_csv(csv_path, parse_dates=['Date'], index_col='Date')
-        
-        # Ensure the index is a datetime index
-        df.index = pd.to_datetime(df.index, utc=True)  # Convert to UTC-aware datetime
-        
-        # Convert the index to the desired timezone
-        df.index = df.index.tz_convert('America/New_York')  # Convert to local timezone if needed
-        
-        return df
+        path = path or csv_path
+        if path is None:
+            raise TypeError("load_historical_data() missing required argument: 'path'")
+
+        if path.endswith('.csv'):
+            # The pyarrow engine parses the CSV (including the UTC-offset dates) in multithreaded C++
+            df = pd.read_csv(path, engine='pyarrow', parse_dates=['Date'], index_col='Date')
+
+            # Dates written without an offset are treated as UTC, as the previous loader did
+            if df.index.tz is None:
+                df.index = df.index.tz_localize('UTC')
+
+            # pyarrow parses to second resolution; match the nanosecond index the Parquet path returns
+            df.index = df.index.tz_convert('America/New_York').as_unit('ns')
+            return df
+
+        # Parquet preserves the tz-aware DatetimeIndex, so no date parsing or conversion is needed
+        return pd.read_parquet(path, engine="pyarrow")
         
-    def get_real_time_price(self) -> pd.DataFrame:
+    def get_real_time_price(self) -> dict:
         """
         Fetches the real-time stock price for the symbol.
-        :return: A DataFrame containing the real-time price and additional info for the stock.
+        :return: A dict containing the real-time price for the stock, or an empty dict if unavailable.
         """
-        stock = yf.Ticker(self.symbol)
-        price_info = stock.history(period='1d')
+        price_info = self._ticker.history(period='1d')
         if not price_info.empty:
-            latest_price = price_info['Close'].iloc[-1]
-            return pd.DataFrame([{'Symbol': self.symbol, 'Price': latest_price}])
-        return pd.DataFrame()
+            latest_price = float(price_info['Close'].iloc[-1])
+            return {'Symbol': self.symbol, 'Price': latest_price}
+        return {}
 
-    def get_metadata(self) -> pd.DataFrame:
+    def get_metadata(self) -> dict:
         """
         Fetches metadata (e.g., market cap, sector) for the stock symbol.
-        :return: A DataFrame containing metadata for the stock.
+        :return: A dict containing metadata for the stock.
         """
-        stock = yf.Ticker(self.symbol)
-        info = stock.info
+        info = _ticker_info(self.symbol)
         metadata = {
             'Symbol': self.symbol,
             'Company Name': info.get('shortName'),
@@ -92,9 +241,96 @@ class StockDataFetcher:
             'Sector': info.get('sector'),
             'Industry': info.get('industry'),
         }
-        return pd.DataFrame([metadata])
+        return metadata
     
 
+def lttb_indices(y, n_out: int) -> np.ndarray:
+    """
+    Selects the indices of the visually significant points of a series using
+    the Largest-Triangle-Three-Buckets algorithm.
+
+    :param y: Sequence of values, assumed to be evenly spaced.
+    :param n_out: Number of points to keep.
+    :return: A sorted array of the selected positional indices.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # The first and last points are always kept; the rest are split into equal buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    x = np.arange(n, dtype=float)
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+
+        # Average of the next bucket acts as the third vertex of the triangle
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+
+def ohlc_scattergl_traces(data: pd.DataFrame, hovertext) -> list:
+    """
+    Builds WebGL traces that draw OHLC bars as a high-low segment with open and close ticks.
+
+    :param data: A DataFrame containing historical stock data indexed by date.
+    :param hovertext: Hover text shown for each bar.
+    :return: A list of Scattergl traces.
+    """
+    n = len(data)
+    # Keep the dates as Timestamps; datetime64 values would be stored as raw int64 in an object array
+    dates = data.index.astype(object).to_numpy()
+
+    # Each high-low segment is drawn as (date, low) -> (date, high), separated by gaps
+    segment_x = np.empty(n * 3, dtype=object)
+    segment_x[0::3] = dates
+    segment_x[1::3] = dates
+    segment_x[2::3] = None
+    segment_y = np.empty(n * 3)
+    segment_y[0::3] = data['Low'].to_numpy()
+    segment_y[1::3] = data['High'].to_numpy()
+    segment_y[2::3] = np.nan
+
+    return [
+        go.Scattergl(
+            x=segment_x,
+            y=segment_y,
+            mode='lines',
+            line=dict(color='gray', width=1),
+            name="High/Low",
+            hoverinfo="skip"
+        ),
+        go.Scattergl(
+            x=dates,
+            y=data['Open'],
+            mode='markers',
+            marker=dict(symbol='line-ew-open', size=6, color='gray', line=dict(width=2)),
+            name="Open",
+            hoverinfo="skip"
+        ),
+        go.Scattergl(
+            x=dates,
+            y=data['Close'],
+            mode='markers',
+            marker=dict(symbol='line-ew-open', size=6, color='black', line=dict(width=2)),
+            name="Close",
+            hovertext=hovertext,
+            hoverinfo="text"
+        ),
+    ]
+
+
 def plot_candle_interactive(data, start_date=None, end_date=None):
     """
     Plots an interactive candlestick chart with hover information.
@@ -102,51 +338,65 @@ def plot_candle_interactive(data, start_date=None, end_date=None):
     :param data: A DataFrame containing historical stock data.
     :param start_date: The start date for filtering the data (inclusive).
     :param end_date: The end date for filtering the data (inclusive).
+    :return: An HTML fragment with the chart, loading plotly.js from the CDN.
     """
-    # Ensure the 'Date' column is the index (since you're using index as Date)
-    data['Date'] = data.index  # Make sure index is used as 'Date'
-
-    # Convert the start_date and end_date to the same timezone as data's Date column
+    # Build the start_date and end_date bounds directly in the timezone of data's index
+    tz = data.index.tz
     if start_date:
-        start_date = pd.to_datetime(start_date).tz_localize(data['Date'].dt.tz)
+        start_date = pd.Timestamp(start_date, tz=tz)
     if end_date:
-        end_date = pd.to_datetime(end_date).tz_localize(data['Date'].dt.tz)
+        end_date = pd.Timestamp(end_date, tz=tz)
 
-    # Filter data for the specified date range
-    if start_date:
-        data = data[data['Date'] >= start_date]
-    if end_date:
-        data = data[data['Date'] <= end_date]
-    
-    # Calculate percent change
-    data['Percent Change'] = (data['Close'] - data['Open']) / data['Open'] * 100
-
-    # Create the candlestick chart
-    fig = go.Figure(data=[go.Candlestick(
-        x=data['Date'],
-        open=data['Open'],
-        high=data['High'],
-        low=data['Low'],
-        close=data['Close'],
-        hovertext=[
-            f"Open: {row['Open']}<br>Close: {row['Close']}<br>Percent Change: {row['Percent Change']:.2f}%<br>Date: {row['Date']}"
-            for _, row in data.iterrows()
-        ],
-        hoverinfo="text"
-    )])
+    # Filter data for the specified date range; the index is sorted, so slice it directly
+    data = data.loc[start_date:end_date]
 
-    # Add markers for earnings report days
-    earnings_dates = data[data['HasEarningsReport'] == True]
+    # Calculate percent change in a single float64 buffer to avoid intermediate Series
+    open_prices = data['Open'].to_numpy(dtype=np.float64)
+    percent_change = np.subtract(data['Close'].to_numpy(dtype=np.float64), open_prices)
+    np.divide(percent_change, open_prices, out=percent_change)
+    np.multiply(percent_change, 100.0, out=percent_change)
+
+    # Select earnings report days before downsampling so none of the markers are dropped
+    earnings_dates = data[data['HasEarningsReport']]
+
+    # Pick the renderer from the full range, so downsampled long ranges still use WebGL
+    use_webgl = len(data) > WEBGL_THRESHOLD
+
+    # Downsample long histories so only the visually significant bars reach the browser
+    if len(data) > DOWNSAMPLE_THRESHOLD:
+        indices = lttb_indices(data['Close'], DOWNSAMPLE_POINTS)
+        data = data.iloc[indices]
+        percent_change = percent_change[indices]
 
-    fig.add_trace(go.Scatter(
-        x=earnings_dates['Date'],
+    hovertext = (
+        "Open: " + data['Open'].round(2).astype(str)
+        + "<br>Close: " + data['Close'].round(2).astype(str)
+        + "<br>Percent Change: " + pd.Series(percent_change, index=data.index).round(2).astype(str)
+        + "%<br>Date: " + data.index.strftime('%Y-%m-%d')
+    )
+
+    # Create the candlestick chart, switching to WebGL traces for long ranges
+    if use_webgl:
+        fig = go.Figure(data=ohlc_scattergl_traces(data, hovertext))
+    else:
+        fig = go.Figure(data=[go.Candlestick(
+            x=data.index,
+            open=data['Open'],
+            high=data['High'],
+            low=data['Low'],
+            close=data['Close'],
+            hovertext=hovertext,
+            hoverinfo="text"
+        )])
+
+    # Add markers for earnings report days
+    fig.add_trace(go.Scattergl(
+        x=earnings_dates.index,
         y=earnings_dates['Close'],
         mode='markers',
         marker=dict(symbol='triangle-up', size=10, color='red'),
         name="Earnings Report Day",
-        hovertext=[
-            f"Earnings Report Day<br>Close: {row['Close']}" for _, row in earnings_dates.iterrows()
-        ],
+        hovertext="Earnings Report Day<br>Close: " + earnings_dates['Close'].round(2).astype(str),
         hoverinfo="text"
     ))
 
@@ -158,8 +408,8 @@ def plot_candle_interactive(data, start_date=None, end_date=None):
         xaxis_rangeslider_visible=False
     )
     
-    # Show the figure
-    fig.show()
+    # Render the figure as an embeddable fragment so the client renders it with the CDN plotly.js
+    return pio.to_html(fig, include_plotlyjs='cdn', full_html=False, div_id='stockchart')
 
 
 if __name__ == "__main__":
@@ -167,9 +417,9 @@ if __name__ == "__main__":
     # Initialize the fetcher with a single stock symbol
     stock_fetcher = StockDataFetcher('AAPL')
 
-    # Fetch historical data (past 1 year, daily interval) and save it to a csv
-    # historical_data = stock_fetcher.save_historical_data(csv_path="AAPL_historical_data.csv", period="1y", interval="1d")
-    historical_data = stock_fetcher.load_historical_data("AAPL_historical_data.csv")
+    # Fetch historical data (past 1 year, daily interval) and save it to a parquet file
+    # stock_fetcher.save_historical_data(stock_fetcher.fetch_historical_data(period="1y", interval="1d"), "AAPL_historical_data.parquet")
+    historical_data = stock_fetcher.load_historical_data("AAPL_historical_data.parquet")
     print(historical_data)
 
     # Fetch real-time stock price
@@ -181,4 +431,6 @@ if __name__ == "__main__":
     print(metadata)  # Display metadata for AAPL
 
     # Plot candlestick chart using the historical data
-    plot_candle_interactive(historical_data, start_date='2024-01-01', end_date='2024-10-01')
\ No newline at end of file
+    chart_html = plot_candle_interactive(historical_data, start_date='2024-01-01', end_date='2024-10-01')
+    with open("AAPL_chart.html", "w", encoding="utf-8") as file:
+        file.write(chart_html)
\ No newline at end of file
@@ -1,7 +1,17 @@
+import io
 import os
+import re
+import asyncio
 import constants
+import tiktoken
 from langchain_openai import ChatOpenAI
 
+# Transcripts longer than this many tokens are summarized chunk by chunk and then combined
+CHUNK_TOKENS = 3000
+
+# Matches each non-blank line (absorbing any blank lines before it) without its surrounding whitespace
+_BULLET_RE = re.compile(r'^\s*(\S.*?)[^\S\n]*$', re.M)
+
 class TextSummarizer:
     def __init__(self, api_key: str = None, file_path: str = None):
         """
@@ -14,8 +24,8 @@ class TextSummarizer:
         self.api_key = api_key or constants.APIKEY
         os.environ["OPENAI_API_KEY"] = self.api_key
         
-        # Initialize the ChatOpenAI model
-        self.model = ChatOpenAI()
+        # The ChatOpenAI model is created on first use so importing/constructing stays cheap
+        self.model = None
 
         # Set the file path
         self.file_path = file_path
@@ -39,16 +49,31 @@ class TextSummarizer:
     def summarize_text(self):
         """
         Summarizes the loaded text content using the OpenAI model.
+        text_content may be a string or a text stream, which is read line by line while chunking.
         """
         if self.text_content:
             try:
-                prompt = (
-                    "Please summarize the following earnings transcript and extract key insights that investors might find useful. "
-                    "Order them as bullet points:\n\n"
-                    f"{self.text_content}"
-                )
-                # Get the summary from the model
-                response = self.model(prompt)
+                chunks = self.split_text(self.text_content)
+                if not chunks:
+                    print("No text content loaded to summarize.")
+                    return
+
+                if self.model is None:
+                    self.model = ChatOpenAI()
+
+                if len(chunks) == 1:
+                    # Get the summary from the model
+                    response = self.model.invoke(self.build_prompt(chunks[0]))
+                else:
+                    # Summarize every chunk concurrently, then combine the partial summaries
+                    partial_summaries = asyncio.run(self.summarize_chunks(chunks))
+                    prompt = (
+                        "The following are bullet point summaries of consecutive sections of an earnings transcript. "
+                        "Combine them into a single list of the key insights that investors might find useful, "
+                        "removing duplicates. Order them as bullet points:\n\n"
+                        + "\n\n".join(partial.content for partial in partial_summaries)
+                    )
+                    response = self.model.invoke(prompt)
 
                 # Extract the text from the AIMessage object
                 if hasattr(response, 'content'):
@@ -59,11 +84,59 @@ class TextSummarizer:
                     print(self.summary)  # For debugging
                 else:
                     print("No summary generated.")
+            except UnicodeDecodeError:
+                # Streamed text is decoded while chunking; let the caller report undecodable input
+                raise
             except Exception as e:
                 print(f"Error summarizing text: {e}")
         else:
             print("No text content loaded to summarize.")
 
+    def build_prompt(self, text):
+        """
+        Builds the summarization prompt for a piece of transcript text.
+
+        :param text: The transcript text to summarize.
+        :return: The prompt to send to the model.
+        """
+        return (
+            "Please summarize the following earnings transcript and extract key insights that investors might find useful. "
+            "Order them as bullet points:\n\n"
+            f"{text}"
+        )
+
+    def split_text(self, text, chunk_tokens: int = CHUNK_TOKENS):
+        """
+        Splits text into chunks of at most chunk_tokens tokens.
+
+        :param text: The text to split, either a string or a text stream.
+        :param chunk_tokens: Maximum number of tokens per chunk.
+        :return: List of text chunks.
+        """
+        encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        lines = io.StringIO(text) if isinstance(text, str) else text
+
+        # Encode line by line so only the pending chunk's tokens are held, never the whole text's
+        chunks = []
+        tokens = []
+        for line in lines:
+            tokens.extend(encoding.encode(line))
+            while len(tokens) >= chunk_tokens:
+                chunks.append(encoding.decode(tokens[:chunk_tokens]))
+                del tokens[:chunk_tokens]
+        if tokens:
+            chunks.append(encoding.decode(tokens))
+        return chunks
+
+    async def summarize_chunks(self, chunks):
+        """
+        Summarizes each chunk concurrently using the OpenAI model.
+
+        :param chunks: List of text chunks.
+        :return: List of model responses, one per chunk.
+        """
+        return await asyncio.gather(*[self.model.ainvoke(self.build_prompt(chunk)) for chunk in chunks])
+
     def format_summary(self, summary):
         """
         Formats the summary into a bullet point list.
@@ -71,10 +144,8 @@ class TextSummarizer:
         :param summary: The raw summary text.
         :return: Formatted string with bullet points.
         """
-        # Split the summary into lines and create bullet points
-        bullet_points = summary.split('\n')
-        formatted_summary = "\n".join(f"• {point.strip()}" for point in bullet_points if point.strip())
-        return formatted_summary
+        # Prefix every non-blank line with a bullet in a single regex pass
+        return _BULLET_RE.sub(r'• \1', summary).rstrip()
 
     def run(self):
         """
@@ -1,6 +1,8 @@
-from flask import Flask, request, render_template
+from flask import Flask, request, render_template, jsonify
+from flask_caching import Cache
+from functools import lru_cache
+import codecs
 import os
-import getpass
 import sys
 
 # Add FinanceFetch_Cdahlback to sys.path
@@ -17,6 +19,31 @@ from text_summarizer import TextSummarizer
 
 app = Flask(__name__)
 
+# Rendered charts are cached in-process for 5 minutes per (symbol, start_date, end_date)
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300})
+
+
+@lru_cache(maxsize=256)
+def get_stock_fetcher(symbol):
+    """
+    Returns a shared StockDataFetcher per symbol so its Ticker and earnings dates are reused across requests.
+    """
+    return StockDataFetcher(symbol)
+
+
+@cache.memoize()
+def render_stock_chart(symbol, start_date, end_date):
+    """
+    Fetches historical data for the symbol and renders the chart for the given date range.
+    """
+    historical_data = get_stock_fetcher(symbol).fetch_historical_data(period="1y", interval="1d")
+
+    # Filter data for the provided date range
+    filtered_data = historical_data[start_date:end_date]
+
+    # Prepare chart data
+    return plot_candle_interactive(filtered_data)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -31,17 +58,18 @@ def summarize():
         return "No selected file"
 
     if file:
-        # Read the file content
-        text_content = file.read().decode('utf-8')
-
         # Initialize the TextSummarizer with the API key (optional) and without a file path
         summarizer = TextSummarizer(api_key=APIKEY)
-        
-        # Set the loaded content manually from the uploaded file
-        summarizer.text_content = text_content
+
+        # Decode the upload lazily; the summarizer reads it line by line while chunking.
+        # codecs' reader only needs read(), which werkzeug's upload stream has on every Python version.
+        summarizer.text_content = codecs.getreader('utf-8')(file.stream)
         
         # Summarize the text
-        summarizer.summarize_text()
+        try:
+            summarizer.summarize_text()
+        except UnicodeDecodeError:
+            return "File must be UTF-8 encoded text"
         
         # Return the summary to the frontend
         summary = summarizer.summary  # Extract the generated summary
@@ -55,18 +83,21 @@ def view_stock():
     start_date = request.form['start_date']
     end_date = request.form['end_date']
     
-    stock_fetcher = StockDataFetcher(symbol)
-    historical_data = stock_fetcher.fetch_historical_data(period="1y", interval="1d")
-
-    # Filter data for the provided date range
-    filtered_data = historical_data[start_date:end_date]
-
-    # Prepare chart data
-    stock_chart = plot_candle_interactive(filtered_data)
+    stock_chart = render_stock_chart(symbol.upper(), start_date, end_date)
     # print(stock_chart)  # Add this line for debugging
     return render_template('index.html', stock_chart=stock_chart, symbol=symbol)
 
 
+@app.route('/price/<symbol>')
+def price(symbol):
+    return jsonify(get_stock_fetcher(symbol.upper()).get_real_time_price())
+
+
+@app.route('/metadata/<symbol>')
+def metadata(symbol):
+    return jsonify(get_stock_fetcher(symbol.upper()).get_metadata())
+
+
 # Stock chart viewing route
 # @app.route('/view_stock', methods=['POST'])
 # def view_stock():
@@ -0,0 +1,8 @@
+# Patch blocking I/O before anything else is imported so yfinance/OpenAI calls yield to other requests
+from gevent import monkey
+monkey.patch_all()
+
+from app import app
+
+# Run with: gunicorn -k gevent -w $(nproc) -b 0.0.0.0:8000 wsgi:application
+application = app
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+# Add FinanceFetch_Cdahlback to sys.path, the same way the app does
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'FinanceFetch_Cdahlback')))
+import stock_data_fetcher  # noqa: E402
+
+
+def fake_frame(adjusted=True, actions=True, tz_aware=True):
+    """
+    Builds a small OHLCV frame shaped like yfinance output for the given options.
+    """
+    index = pd.date_range('2024-01-02', periods=3, freq='D', tz='America/New_York', name='Date')
+    if not tz_aware:
+        index = index.tz_localize(None)
+
+    columns = ['Open', 'High', 'Low', 'Close', 'Volume'] if adjusted else ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+    if actions:
+        columns += ['Dividends', 'Stock Splits']
+    return pd.DataFrame(1.0, index=index, columns=columns)
+
+
+class FakeTicker:
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, period="1mo", interval="1d"):
+        # Ticker.history() returns adjusted, tz-aware prices with dividend and split columns
+        return fake_frame()
+
+
+def fake_download(tickers, period=None, interval=None, threads=True, group_by="column", progress=True,
+                  auto_adjust=False, actions=False, ignore_tz=None):
+    # Mirrors yf.download's defaults: unadjusted prices, no actions and a tz-naive daily index,
+    # and its upper-casing and de-duplication of the requested tickers
+    symbols = list(dict.fromkeys(ticker.upper() for ticker in tickers.split()))
+    frame = fake_frame(adjusted=auto_adjust, actions=actions, tz_aware=ignore_tz is False)
+    return pd.concat({symbol: frame for symbol in symbols}, axis=1)
+
+
+@pytest.fixture
+def fake_yf(monkeypatch):
+    monkeypatch.setattr(stock_data_fetcher, "yf", SimpleNamespace(Ticker=FakeTicker, download=fake_download))
+
+
+def test_fetch_many_async_branches_return_same_shape(fake_yf):
+    small = ['AAA', 'BBB']
+    large = [f"S{i}" for i in range(stock_data_fetcher.BATCH_DOWNLOAD_THRESHOLD + 1)]
+
+    per_symbol = asyncio.run(stock_data_fetcher.StockDataFetcher.fetch_many_async(small))
+    batched = asyncio.run(stock_data_fetcher.StockDataFetcher.fetch_many_async(large))
+
+    assert set(per_symbol) == set(small)
+    assert set(batched) == set(large)
+
+    expected = per_symbol['AAA']
+    for df in list(per_symbol.values()) + list(batched.values()):
+        assert list(df.columns) == list(expected.columns)
+        assert str(df.index.tz) == str(expected.index.tz)
+
+
+def test_fetch_many_normalizes_symbols(fake_yf):
+    data = stock_data_fetcher.StockDataFetcher.fetch_many(['aapl', 'msft', 'AAPL'])
+
+    assert list(data) == ['AAPL', 'MSFT']
+
+
+def test_lttb_indices_keeps_endpoints_and_n_out_increasing_points():
+    y = np.sin(np.linspace(0, 20, 1000))
+    indices = stock_data_fetcher.lttb_indices(y, 100)
+
+    assert len(indices) == 100
+    assert indices[0] == 0
+    assert indices[-1] == len(y) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+@pytest.mark.parametrize("n_out", [10, 50, 2])
+def test_lttb_indices_passthrough(n_out):
+    # n_out >= n and n_out < 3 both keep every point
+    y = np.arange(10, dtype=float)
+
+    np.testing.assert_array_equal(stock_data_fetcher.lttb_indices(y, n_out), np.arange(10))